@@ -13,6 +13,13 @@ import java.util.logging.Logger;
 
 class ProcessRequest implements Runnable {
 
+    //Longest request line, in characters, accepted before the connection is dropped.
+    private static final int MAX_REQUEST_LINE = 8192;
+    private static final DateTimeFormatter LOG_DATE_FORMAT = DateTimeFormatter.ofPattern("dd/MMM/yyyy HH:mm:ss Z");
+    private static final String NOT_FOUND_PAGE = "<HTML>\r\n"
+            + "<head><title>Resource Not Found</title></head>\r\n"
+            + "<body><h1>404 Error: File not found.</h1>\r\n" + "</body></html>\r\n";
+
     private static File webroot;
     private final Socket socket;
     private Logger auditLog;
@@ -31,8 +38,10 @@ class ProcessRequest implements Runnable {
             StringBuilder requestText = new StringBuilder();
             while (true) {
                 int ch = inputStream.read();
-                if (ch == '\r' || ch == '\n')
+                if (ch == -1 || ch == '\r' || ch == '\n')
                     break;
+                if (requestText.length() >= MAX_REQUEST_LINE)
+                    return;
                 requestText.append((char) ch);
             }
             routeRequest(requestText.toString().split("\\s+"));
@@ -50,6 +59,10 @@ class ProcessRequest implements Runnable {
     }
 
     public void routeRequest(String[] requestHeader) throws IOException {
+        //Drop empty or truncated request lines rather than indexing past the end.
+        if (requestHeader.length < 2) {
+            return;
+        }
         String fileName = requestHeader[1];
         //if(fileName == ""){ emptyRequest()}; Handle default file, such as index.html or 404.
         fileName = fileName.substring(1);
@@ -64,7 +77,7 @@ class ProcessRequest implements Runnable {
         try {
             OutputStream outputStream = new BufferedOutputStream(socket.getOutputStream());
             Writer writer = new OutputStreamWriter(outputStream);
-            if (!file.canRead() || !file.getCanonicalPath().startsWith(webroot.getCanonicalPath())) {
+            if (!file.isFile() || !file.canRead() || !file.getCanonicalPath().startsWith(webroot.getCanonicalPath())) {
                 resourceNotFound(writer, version);
                 return;
             }
@@ -95,26 +108,29 @@ class ProcessRequest implements Runnable {
 
     private void HTTPGet(OutputStream outputStream, Writer writer, File file, String mimeType, String version)
             throws IOException {
-        byte[] rawData = Files.readAllBytes(file.toPath());
+        //Stream the file to the client instead of holding the whole body in memory.
+        long length = file.length();
         String code = "404";
         if (version.startsWith("HTTP/")) {
-            sendHeader(writer, "HTTP/1.0 200 OK", mimeType, rawData.length);
+            sendHeader(writer, "HTTP/1.0 200 OK", mimeType, length);
             code = "200";
         }
-        logRequest("GET", file.getName(), "HTTP/1.0", code, rawData.length);
-        outputStream.write(rawData);
+        logRequest("GET", file.getName(), "HTTP/1.0", code, length);
+        Files.copy(file.toPath(), outputStream);
         outputStream.flush();
         return;
     }
 
     private void HTTPHead(Writer writer, File file, String mimeType, String version) throws IOException {
-        byte[] rawData = Files.readAllBytes(file.toPath());
+        //Only the length is needed for a HEAD response, so don't read the file contents.
+        //routeRequest only lets regular files through, so File.length() is the body size.
+        long length = file.length();
         String code = "404";
         if (version.startsWith("HTTP/")) {
-            sendHeader(writer, "HTTP/1.0 204 OK", mimeType, rawData.length);
+            sendHeader(writer, "HTTP/1.0 204 OK", mimeType, length);
             code = "204";
         }
-        logRequest("HEAD", file.getName(), "HTTP/1.0", code, rawData.length);
+        logRequest("HEAD", file.getName(), "HTTP/1.0", code, length);
         return;
     }
 
@@ -123,31 +139,29 @@ class ProcessRequest implements Runnable {
     }
 
     public void resourceNotFound(Writer writer, String version) throws IOException {
-        String response = new StringBuilder("<HTML>\r\n").append("<head><title>Resource Not Found</title></head>\r\n")
-                .append("<body>").append("<h1>404 Error: File not found.</h1>\r\n").append("</body></html>\r\n")
-                .toString();
         if (version.startsWith("HTTP/")) {
-            sendHeader(writer, "HTTP/1.0 404 File not found!", "text/html; charset=utf-8", response.length());
+            sendHeader(writer, "HTTP/1.0 404 File not found!", "text/html; charset=utf-8", NOT_FOUND_PAGE.length());
         }
-        writer.write(response);
+        writer.write(NOT_FOUND_PAGE);
         writer.flush();
         return;
     }
 
-    private void sendHeader(Writer writer, String responseCode, String mimeType, int length) throws IOException {
-        writer.write(responseCode + "\r\n");
-        writer.write("Date: " + (new Date()) + "\r\n");
-        writer.write("Server: Nick's CSC 583 Final Project HTTPServer\r\n");
-        writer.write("Content-length: " + length + "\r\n");
-        writer.write("Content-type: " + mimeType + "\r\n\r\n");
+    private void sendHeader(Writer writer, String responseCode, String mimeType, long length) throws IOException {
+        String header = new StringBuilder(responseCode).append("\r\n")
+                .append("Date: ").append(new Date()).append("\r\n")
+                .append("Server: Nick's CSC 583 Final Project HTTPServer\r\n")
+                .append("Content-length: ").append(length).append("\r\n")
+                .append("Content-type: ").append(mimeType).append("\r\n\r\n")
+                .toString();
+        writer.write(header);
         writer.flush();
         return;
     }
-    public void logRequest(String verb, String fileName, String version, String code, int bytes){
+    public void logRequest(String verb, String fileName, String version, String code, long bytes){
         //127.0.0.1 - - [10/Oct/2000:13:55:36 -0700] "GET /apache_pb.gif HTTP/1.0" 200 2326
         ZonedDateTime time = ZonedDateTime.now(ZoneId.systemDefault());
-        DateTimeFormatter dateFormatter = DateTimeFormatter.ofPattern("dd/MMM/yyyy HH:mm:ss Z");
-        String formattedTime = time.format(dateFormatter);
+        String formattedTime = time.format(LOG_DATE_FORMAT);
         String logInfo = socket.getRemoteSocketAddress().toString() + " - - ";
         logInfo += "[" + formattedTime + "]";
         logInfo += " \"" + verb + "/" + fileName + "/" + version + "\" " + code + " " + bytes;
@@ -57,7 +57,7 @@ public class Servlet extends Thread{
     }
 
     private void setAuditLogHandler() {
-        File logFile = new File(webroot.toString() + "/logs/server_log.log");
+        File logFile = new File(new File(webroot, "logs"), "server_log.log");
         try{
             fileHandler = new FileHandler(logFile.toString());
             auditLog.addHandler(fileHandler);